@@ -74,6 +74,7 @@ def backup_record_obj_to_dict(backup: DynamoDBTableBackupWithETag) -> dict:
     }
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda function to list DynamoDB backups."""
     clumio_token: str | None = events.get('clumio_token', None)
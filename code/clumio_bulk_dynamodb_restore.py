@@ -29,6 +29,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:  # noqa: PLR0911
     """Handle the lambda function to bulk restore DynamoDB."""
     clumio_token: str | None = events.get('clumio_token', None)
@@ -74,13 +75,12 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         target=restore_target,
     )
 
-    inputs = {
-        'resource_type': 'DynamoDB',
-        'run_token': common.generate_random_string(),
-        'task': None,
-        'source_backup_id': source_backup_id,
-        'source_table_name': source_table_name,
-    }
+    inputs.update(
+        run_token=common.get_run_token(context),
+        task=None,
+        source_backup_id=source_backup_id,
+        source_table_name=source_table_name,
+    )
     try:
         # Run restore.
         logger.info('Restore DynamoDB table from backup ID %s...', source_backup_id)
@@ -96,7 +96,7 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
                 'inputs': inputs,
             }
         logger.info('DynamoDB restore task %s started successfully.', result.task_id)
-        inputs['task'] = result.task_id
+        common.set_restore_task(inputs, result.task_id)
         return {'status': 200, 'msg': 'completed', 'inputs': inputs}
     except exceptions.clumio_exception.ClumioException as e:
         logger.error('DynamoDB restore failed with exception: %s', e)
@@ -32,6 +32,7 @@ IOPS_APPLICABLE_TYPE: Final = ['gp3', 'io1', 'io2']
 
 
 # noqa: PLR0911, PLR0912, PLR0915
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:  # noqa: PLR0911, PLR0912, PLR0915
     """Handle the lambda function to bulk restore EBS."""
     record: dict = events.get('record', {})
@@ -104,13 +105,11 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         source=source, target=restore_target
     )
 
-    inputs = {
-        'resource_type': 'EBS',
-        'run_token': common.generate_random_string(),
-        'task': None,
-        'source_backup_id': source_backup_id,
-        'source_volume_id': source_volume_id,
-    }
+    inputs.update(
+        run_token=common.get_run_token(context),
+        source_backup_id=source_backup_id,
+        source_volume_id=source_volume_id,
+    )
 
     try:
         request_dict = api_helper.to_dictionary(request)
@@ -127,7 +126,7 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
                 'inputs': inputs,
             }
         logger.info('EBS restore task %s started successfully.', result.task_id)
-        inputs['task'] = result.task_id
+        common.set_restore_task(inputs, result.task_id)
         return {'status': 200, 'msg': 'completed', 'inputs': inputs}
     except exceptions.clumio_exception.ClumioException as e:
         logger.error('EBS restore failed with exception: %s', e)
@@ -70,6 +70,7 @@ def backup_record_obj_to_dict(backup: EC2Backup) -> dict:
     }
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda function to retrieve the EC2 backup list."""
     clumio_token: str | None = events.get('clumio_token', None)
@@ -29,6 +29,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:  # noqa: PLR0911, PLR0912, PLR0915
     """Handle the lambda function to bulk restore EC2."""
     record = events.get('record', {})
@@ -143,13 +144,11 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         target=restore_target,
     )
 
-    inputs = {
-        'resource_type': 'EC2',
-        'run_token': common.generate_random_string(),
-        'task': None,
-        'source_backup_id': source_backup_id,
-        'source_instance_id': source_instance_id,
-    }
+    inputs.update(
+        run_token=common.get_run_token(context),
+        source_backup_id=source_backup_id,
+        source_instance_id=source_instance_id,
+    )
 
     try:
         request_dict = api_helper.to_dictionary(request)
@@ -166,7 +165,7 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
                 'inputs': inputs,
             }
         logger.info('EC2 restore task %s started successfully.', result.task_id)
-        inputs['task'] = result.task_id
+        common.set_restore_task(inputs, result.task_id)
         return {'status': 200, 'msg': 'completed', 'inputs': inputs}
     except exceptions.clumio_exception.ClumioException as e:
         logger.error('EC2 restore failed with exception: %s', e)
@@ -10,11 +10,11 @@ import os
 from typing import TYPE_CHECKING, Any
 
 import common
-from clumioapi import clumioapi_client, configuration
 from clumioapi.exceptions import clumio_exception
 
 if TYPE_CHECKING:
     from aws_lambda_powertools.utilities.typing import LambdaContext
+    from clumioapi import clumioapi_client
     from common import EventsTypeDef
 
 logger = logging.getLogger()
@@ -71,6 +71,7 @@ def get_endpoint_mappings(
     }
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda functions to invoke Clumio REST APIs.
 
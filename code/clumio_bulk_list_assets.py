@@ -20,6 +20,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:  # noqa: PLR0911 PLR0912 PLR0915
     """Handle the lambda functions to list of the assets given the env and resource type."""
     # Retrieve and validate the inputs.
@@ -79,7 +80,7 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         list_filter['backup_status'] = {'$in': backup_status}
     if is_deleted:
         list_filter['is_deleted'] = {'$in': is_deleted}
-    logger.info('Listing assets with filter: %s', json.dumps(list_filter, indent=2))
+    logger.info('Listing assets with filter: %s', list_filter)
 
     # Get the asset listing function based on the resource type.
     if resource_type == 'EBS':
@@ -60,6 +60,7 @@ def backup_record_obj_to_dict(backup: RdsDatabaseBackup) -> dict:
     }
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda function to retrieve the RDS backup list."""
     clumio_token = events.get('clumio_token', None)
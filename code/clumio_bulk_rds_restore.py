@@ -29,6 +29,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger()
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:  # noqa: PLR0915, PLR0911
     """Handle the lambda function to bulk restore RDS."""
     record: dict = events.get('record', {})
@@ -86,13 +87,12 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         source=restore_source,
         target=restore_target,
     )
-    inputs = {
-        'resource_type': 'RDS',
-        'run_token': common.generate_random_string(),
-        'task': None,
-        'source_backup_id': source_backup_id,
-        'source_resource_id': source_resource_id,
-    }
+    inputs.update(
+        run_token=common.get_run_token(context),
+        task=None,
+        source_backup_id=source_backup_id,
+        source_resource_id=source_resource_id,
+    )
     try:
         logger.info('Restore RDS from backup %s...', restore_source.backup.backup_id)
         raw_response, result = client.restored_aws_rds_resources_v1.restore_aws_rds_resource(
@@ -108,7 +108,7 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
                 'inputs': inputs,
             }
         logger.info('RDS restore task %s completed successfully.', result.task_id)
-        inputs['task'] = result.task_id
+        common.set_restore_task(inputs, result.task_id)
         return {'status': 200, 'msg': 'completed', 'inputs': inputs}
     except exceptions.clumio_exception.ClumioException as e:
         logger.error('RDS restore failed with exception: %s', e)
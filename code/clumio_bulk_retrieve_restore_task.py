@@ -17,17 +17,89 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, Final
 
 import common
 
 if TYPE_CHECKING:
     from aws_lambda_powertools.utilities.typing import LambdaContext
+    from clumioapi import clumioapi_client
     from common import EventsTypeDef
 
 logger = logging.getLogger(__name__)
 
+POLL_TIMEOUT_SECONDS: Final = 600
+MIN_POLL_INTERVAL_SECONDS: Final = 2
+MAX_POLL_INTERVAL_SECONDS: Final = 30
 
+
+def poll_later(inputs: dict, msg: str, seconds: float | None = None) -> dict[str, Any]:
+    """Hand the task back to the state machine to be polled again later.
+
+    Args:
+        inputs: The inputs of the task poller, updated with the next poll delay.
+        msg: Why the task is not done yet.
+        seconds: How long to wait before the next poll, if known.
+    """
+    common.set_next_poll(inputs, seconds)
+    return {'status': 205, 'msg': msg, 'inputs': inputs}
+
+
+def poll_task(
+    client: clumioapi_client.ClumioAPIClient, task_id: str, inputs: dict
+) -> dict[str, Any]:
+    """Poll the restore task until it is done or the poll timeout is reached."""
+    status = None
+    deadline = time.monotonic() + POLL_TIMEOUT_SECONDS
+    interval = MIN_POLL_INTERVAL_SECONDS
+    while True:
+        try:
+            raw_response, response = client.tasks_v1.read_task(task_id=task_id)
+        except TypeError:
+            logger.error('[%s] Failed to read task.', task_id)
+            return {
+                'status': 401,
+                'msg': 'user not authorized to access task.',
+                'inputs': inputs,
+            }
+        if raw_response.status_code in common.RETRYABLE_STATUS_CODES:
+            # Let the state machine wait instead of polling a throttled API.
+            retry_after = common.get_retry_after(raw_response)
+            logger.warning(
+                '[%s] Read task throttled with status %s, retry after %s seconds.',
+                task_id,
+                raw_response.status_code,
+                retry_after,
+            )
+            return poll_later(
+                inputs, f'task read throttled - {raw_response.status_code}', retry_after
+            )
+        if not raw_response.ok:
+            logger.error('[%s] Read task failed: %s', task_id, raw_response.content)
+            return {
+                'status': 401,
+                'msg': f'failed to read task - {raw_response.status_code}',
+                'inputs': inputs,
+            }
+        status = response.status
+        logger.info('[%s] Task status %s.', task_id, status)
+        if status == 'completed':
+            return {'status': 200, 'msg': 'task completed', 'inputs': inputs}
+        if status in ('failed', 'aborted'):
+            return {'status': 403, 'msg': f'task failed {status}', 'inputs': inputs}
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning(
+                '[%s] Task timed out after polling. Last known status: %s.', task_id, status
+            )
+            return poll_later(inputs, f'task not done - {status}')
+        # Back off exponentially, without sleeping past the deadline.
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, MAX_POLL_INTERVAL_SECONDS)
+
+
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda function to retrieve the EC2 restore task."""
     clumio_token: str | None = events.get('clumio_token', None)
@@ -39,31 +111,14 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
     if not task_id:
         return {'status': 402, 'msg': 'no task id', 'inputs': inputs}
 
+    # Skip the poll while the task cannot have completed yet.
+    poll_delay = common.get_poll_delay(inputs)
+    if poll_delay > 0:
+        return poll_later(inputs, 'task not yet pollable', poll_delay)
+
     # If clumio bearer token is not passed as an input read it from the AWS secret.
     clumio_token = common.get_bearer_token_if_not_exists(clumio_token)
 
     # Initiate the Clumio API client.
-    client = common.get_clumio_api_client(base_url, clumio_token, raw_response=False)
-    status = None
-    try:
-        for _ in common.simple_timer(600, 20):
-            try:
-                response = client.tasks_v1.read_task(task_id=task_id)
-                status = response.status
-                logger.info('[%s] Task status %s.', task_id, status)
-                if status == 'completed':
-                    break
-                if status in ('failed', 'aborted'):
-                    return {'status': 403, 'msg': f'task failed {status}', 'inputs': inputs}
-            except TypeError:
-                logger.error('[%s] Failed to read task.', task_id)
-                return {
-                    'status': 401,
-                    'msg': 'user not authorized to access task.',
-                    'inputs': inputs,
-                }
-    except common.TimeoutException:
-        logger.warning('[%s] Task timed out after polling. Last known status: %s.', task_id, status)
-        return {'status': 205, 'msg': f'task not done - {status}', 'inputs': inputs}
-
-    return {'status': 200, 'msg': 'task completed', 'inputs': inputs}
+    client = common.get_clumio_api_client(base_url, clumio_token)
+    return poll_task(client, task_id, inputs)
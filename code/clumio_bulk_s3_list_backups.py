@@ -16,20 +16,50 @@
 
 from __future__ import annotations
 
-import json
+import concurrent.futures
 import logging
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, Final
 
 import common
 from clumioapi.exceptions import clumio_exception
 
 if TYPE_CHECKING:
     from aws_lambda_powertools.utilities.typing import LambdaContext
+    from clumioapi import clumioapi_client
     from common import EventsTypeDef
 
 logger = logging.getLogger(__name__)
 
+# How long a protection group ID is reused by a warm container.
+PG_ID_CACHE_TTL_SECONDS: Final = 300
 
+_PG_ID_CACHE: dict[tuple[clumioapi_client.ClumioAPIClient, str], tuple[str, float]] = {}
+
+
+def get_protection_group_id(client: clumioapi_client.ClumioAPIClient, name: str) -> str:
+    """Get the ID of the protection group with the given name.
+
+    The result is cached per client, i.e. per token, for PG_ID_CACHE_TTL_SECONDS
+    so a protection group recreated under the same name is picked up shortly
+    after. A missing protection group raises common.Error and is not cached.
+    """
+    pg_id, expires = _PG_ID_CACHE.get((client, name), ('', 0.0))
+    if pg_id and time.monotonic() < expires:
+        return pg_id
+    api_filter = {'name': {'$eq': name}}
+    logger.info('List protection groups with filter %s...', api_filter)
+    pg_list = common.get_first_page(
+        function=client.protection_groups_v1.list_protection_groups, api_filter=api_filter
+    )
+    if not pg_list:
+        raise common.Error(f'Protection group {name} not found.')
+    pg_id = pg_list[0].p_id
+    _PG_ID_CACHE[client, name] = (pg_id, time.monotonic() + PG_ID_CACHE_TTL_SECONDS)
+    return pg_id
+
+
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:  # noqa: PLR0911 PLR0912 PLR0915
     """Handle the lambda function to bulk list S3 backups."""
     clumio_token: str | None = events.get('clumio_token', None)
@@ -58,9 +88,8 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         # Get filter from input to the restore state machine.
         object_filters = target.get('search_object_filters', {})
 
-    # Ensure required filter latest_version_only is specified.
-    if 'latest_version_only' not in object_filters:
-        object_filters['latest_version_only'] = True
+    # Ensure required filter latest_version_only is specified, without mutating the input.
+    object_filters = {'latest_version_only': True, **object_filters}
 
     # If clumio bearer token is not passed as an input read it from the AWS secret.
     clumio_token = common.get_bearer_token_if_not_exists(clumio_token)
@@ -80,31 +109,43 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
     logger.info('Filter PG %s by bucket names: %s', search_name, s3_bucket_names)
 
     try:
-        # List protection group based on the name.
-        api_filter = {'name': {'$eq': search_name}}
-        logger.info('List protection groups with filter %s...', api_filter)
-        pg_list = common.get_total_list(
-            function=client.protection_groups_v1.list_protection_groups,
-            api_filter=json.dumps(api_filter),
-        )
-        if not pg_list:
+        # Get the protection group based on the name. The environment lookup does not
+        # depend on it, run both at once.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            pg_future = executor.submit(get_protection_group_id, client, search_name)
+            env_future = executor.submit(
+                common.get_environment_id, client, source_account, source_region
+            )
+        env_resp, env_id = env_future.result()
+        try:
+            pg_id = pg_future.result()
+        except common.Error:
             return {'status': 207, 'records': [], 'target': target, 'msg': 'empty pg list'}
-        pg_id = pg_list[0].p_id
         logger.info('Found protection group %s.', search_name)
 
         # List S3 assets based on the bucket names and pg name.
         api_filter = {'protection_group_id': {'$eq': pg_id}}
-        env_resp, env_id = common.get_environment_id(client, source_account, source_region)
         if source_region and env_resp == common.STATUS_OK:
             # If region filter is provided, filter per region.
             api_filter['environment_id'] = {'$eq': env_id}
         logger.info('List buckets with filter %s...', api_filter)
-        pg_assets = common.get_total_list(
-            function=client.protection_groups_s3_assets_v1.list_protection_group_s3_assets,
-            api_filter=json.dumps(api_filter),
-        )
-        logger.info('Found %s buckets in the protection group.', len(pg_assets))
+        list_pg_assets = client.protection_groups_s3_assets_v1.list_protection_group_s3_assets
+        if s3_bucket_names:
+            # Stop paging once every bucket of the filter has been found.
+            pg_assets = []
+            missing_bucket_names = set(s3_bucket_names)
+            for item in common.iter_total_list(function=list_pg_assets, api_filter=api_filter):
+                pg_assets.append(item)
+                missing_bucket_names.discard(item.bucket_name)
+                if not missing_bucket_names:
+                    break
+        else:
+            pg_assets = common.get_total_list(function=list_pg_assets, api_filter=api_filter)
+        logger.info('Listed %s buckets in the protection group.', len(pg_assets))
         if not pg_assets:
+            # The cached ID may belong to a deleted protection group, look it up again next time.
+            _PG_ID_CACHE.pop((client, search_name), None)
+            logger.warning('No assets found for protection group %s (%s).', search_name, pg_id)
             return {
                 'status': 207,
                 'records': [],
@@ -117,14 +158,13 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
             s3_bucket_names = [item.bucket_name for item in pg_assets]
         else:
             # Remove any buckets from the filter that do not exist in the protection group.
-            all_bucket_names = [item.bucket_name for item in pg_assets]
-            bucket_names = s3_bucket_names.copy()
-            for bucket_name in bucket_names:
-                if bucket_name not in all_bucket_names:
-                    logger.warning('Bucket %s does not exist in the protection group.', bucket_name)
-                    s3_bucket_names.remove(bucket_name)
+            all_bucket_names = {item.bucket_name for item in pg_assets}
+            for bucket_name in set(s3_bucket_names) - all_bucket_names:
+                logger.warning('Bucket %s does not exist in the protection group.', bucket_name)
+            s3_bucket_names = [name for name in s3_bucket_names if name in all_bucket_names]
             # Only buckets matching filter will be restored.
-            asset_ids = [item.p_id for item in pg_assets if item.bucket_name in s3_bucket_names]
+            bucket_set = frozenset(s3_bucket_names)
+            asset_ids = [item.p_id for item in pg_assets if item.bucket_name in bucket_set]
             logger.info('Found %s buckets matching the filter.', len(asset_ids))
             if not asset_ids:
                 # All buckets filtered out so nothing to restore in this protection group.
@@ -141,29 +181,24 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         )
         api_filter['protection_group_id'] = {'$eq': pg_id}
         logger.info('List backups for protection group %s...', search_name)
-        raw_backup_records = common.get_total_list(
+        # Only the first backup in sort order is restored, no need to page through the rest.
+        raw_backup_records = common.get_first_page(
             function=client.backup_protection_groups_v1.list_backup_protection_groups,
-            api_filter=json.dumps(api_filter),
+            api_filter=api_filter,
             sort=sort,
         )
-        logger.info(
-            'Found %s backups for protection group %s.', len(raw_backup_records), search_name
-        )
         if not raw_backup_records:
             return {'status': 207, 'records': [], 'target': target, 'msg': 'empty set'}
-
-        records = []
-        for item in raw_backup_records:
-            records.append(
-                {
-                    'backup_id': item.p_id,
-                    'pg_name': search_name,
-                    'pg_asset_ids': asset_ids,
-                    'pg_bucket_names': s3_bucket_names,
-                    'object_filters': object_filters,
-                }
-            )
-        return {'status': 200, 'records': records[:1], 'target': target, 'msg': 'completed'}
+        logger.info('Found backup for protection group %s.', search_name)
+
+        record = {
+            'backup_id': raw_backup_records[0].p_id,
+            'pg_name': search_name,
+            'pg_asset_ids': asset_ids,
+            'pg_bucket_names': s3_bucket_names,
+            'object_filters': object_filters,
+        }
+        return {'status': 200, 'records': [record], 'target': target, 'msg': 'completed'}
     except clumio_exception.ClumioException as e:
         # This exception could come from multiple API calls above.
         logger.error('Hit exception trying to retrieve protection group backups: %s', e)
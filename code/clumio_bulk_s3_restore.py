@@ -16,7 +16,6 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import TYPE_CHECKING, Any
 
@@ -31,6 +30,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda function to bulk restore S3."""
     clumio_token: str | None = events.get('clumio_token', None)
@@ -54,14 +54,16 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
     }
     try:
         logger.info('List S3 buckets with filter %s...', api_filter)
-        s3_buckets = common.get_total_list(
-            function=client.aws_s3_buckets_v1.list_aws_s3_buckets, api_filter=json.dumps(api_filter)
+        # Only the first match is used, request a single item.
+        s3_buckets = common.get_first_page(
+            function=client.aws_s3_buckets_v1.list_aws_s3_buckets, api_filter=api_filter, limit=1
         )
         if not s3_buckets:
             logger.error('Target bucket %s not found.', target_bucket)
             return {'status': 207, 'msg': 'no target bucket found', 'inputs': target}
-        target_bucket_id = s3_buckets[0].p_id
-        target_env_id = s3_buckets[0].environment_id
+        s3_bucket = s3_buckets[0]
+        target_bucket_id = s3_bucket.p_id
+        target_env_id = s3_bucket.environment_id
         logger.info('Found target bucket %s with ID %s.', target_bucket, target_bucket_id)
 
         # Build the restore request.
@@ -91,10 +93,10 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
             return {'status': 207, 'msg': 'restore failed', 'inputs': target}
         inputs = {
             'resource_type': 'ProtectionGroup',
-            'task': response.task_id,
             'source_backup_id': record['backup_id'],
             'target': target,
         }
+        common.set_restore_task(inputs, response.task_id)
         logger.info('Started protection group restore task %s.', response.task_id)
         return {'status': 200, 'inputs': inputs, 'msg': 'completed'}
     except clumio_exception.ClumioException as e:
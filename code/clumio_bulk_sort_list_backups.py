@@ -5,7 +5,9 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+import common
 
 if TYPE_CHECKING:
     from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -14,17 +16,17 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, list]:
+@common.skip_warmup
+def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda function to sort the retrieved list of backups."""
     backup_lists: list[dict] = events.get('backup_list', [])
     resource_type: str = events.get('resource_type', 'EBS')
     logger.info('Filter %s %s backups...', len(backup_lists), resource_type)
     # Filter out the empty responses.
-    filtered_backup_lists: list = []
-    for backup_response in backup_lists:
-        record = backup_response.get('records', [])
-        if not record:
-            continue
-        filtered_backup_lists.append(record[0])
+    filtered_backup_lists: list = [
+        records[0]
+        for backup_response in backup_lists
+        if (records := backup_response.get('records'))
+    ]
     logger.info('Filtered down to %s %s backups.', len(filtered_backup_lists), resource_type)
     return {resource_type: filtered_backup_lists}
@@ -7,6 +7,8 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any
 
+import common
+
 if TYPE_CHECKING:
     from aws_lambda_powertools.utilities.typing import LambdaContext
     from common import EventsTypeDef
@@ -14,6 +16,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@common.skip_warmup
 def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
     """Handle the lambda function to validate the input of the bulk restore.
 
@@ -36,13 +39,15 @@ def lambda_handler(events: EventsTypeDef, context: LambdaContext) -> dict[str, A
         default_input = default_input_all.get(resource_type, {})
         # Validate input and replace any empty values with default values.
         for field, value in restore_group.items():
-            if not value and field in default_input and not default_input[field]:
+            if value or field not in default_input:
+                continue
+            default_value = default_input[field]
+            if not default_value:
                 # Return error if both the group and default field is empty.
                 msg = f'Must provide a value for the {resource_type} field {field}.'
                 logger.error(msg)
                 return {'status': 400, 'msg': msg}
-            if not value and field in default_input and default_input[field]:
-                # Update the field to the default value.
-                restore_group[field] = default_input[field]
+            # Update the field to the default value.
+            restore_group[field] = default_value
     logger.info('Validate input successful.')
     return {'status': 200, 'RestoreGroups': restore_groups}
@@ -5,17 +5,20 @@
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
 import json
 import logging
+import math
 import os
+import random
 import secrets
 import string
 import time
+import urllib.parse
 from collections.abc import Callable, Generator
 from typing import TYPE_CHECKING, Any, Final, Protocol
 
-import boto3
-import botocore.exceptions
 from clumioapi import clumioapi_client, configuration, exceptions
 from clumioapi.models import aws_tag_common_model
 from utils import dates
@@ -23,7 +26,12 @@ from utils import dates
 if TYPE_CHECKING:
     EventsTypeDef = dict[str, Any]
     StatusAndMsgTypeDef = tuple[int, str]
+    import requests
+    from aws_lambda_powertools.utilities.typing import LambdaContext
     from clumioapi.models.list_aws_environments_response import ListAWSEnvironmentsResponse
+    from mypy_boto3_secretsmanager import SecretsManagerClient
+
+    HandlerTypeDef = Callable[[EventsTypeDef, LambdaContext], dict[str, Any]]
 
     class ListingCallable(Protocol):
         def __call__(self, filter: str | None, sort: str | None, start: int) -> Any: ...
@@ -33,12 +41,34 @@ DEFAULT_BASE_URL: Final = 'https://us-west-2.api.clumio.com/'
 DEFAULT_SECRET_PATH: Final = 'clumio/token/bulk_restore'  # noqa: S105
 ERROR_CODE: Final = 402
 MAX_RETRY: Final = 5
+# Restore tasks never complete this soon after being submitted.
+MIN_POLL_AFTER_SECONDS: Final = 30
+# Pages fetched at once by get_total_list, kept low to stay clear of the API rate limits.
+LIST_WORKERS: Final = 4
+# Largest page size accepted by the Clumio list APIs.
+PAGE_LIMIT: Final = 100
 START_TIMESTAMP_STR: Final = 'start_timestamp'
 STATUS_OK: Final = 200
 RESOURCE_TYPES: Final = ['EBS', 'EC2', 'RDS', 'DynamoDB', 'ProtectionGroup']
+RETRYABLE_STATUS_CODES: Final = (429, 502, 503, 504)
+RETRY_BASE_DELAY_SECONDS: Final = 0.1
+# How long a token read from Secrets Manager is reused by a warm container.
+TOKEN_CACHE_TTL_SECONDS: Final = 300
+# Sized for the Step Functions Map fan-out, fail fast on unreachable endpoints.
+SECRETS_MANAGER_CONFIG: Final[dict[str, Any]] = {
+    'connect_timeout': 2,
+    'read_timeout': 5,
+    'max_pool_connections': 50,
+    'tcp_keepalive': True,
+    'retries': {'max_attempts': 3, 'mode': 'adaptive'},
+}
 
 logger = logging.getLogger(__name__)
 
+# Bearer tokens read from Secrets Manager and their time.monotonic() expiry, by secret ARN.
+_TOKEN_CACHE: dict[str, tuple[str, float]] = {}
+_SYSTEM_RANDOM = secrets.SystemRandom()
+
 
 class Error(Exception):
     """Base exception class."""
@@ -49,8 +79,29 @@ class TimeoutException(Error):
 
 
 def parse_base_url(base_url: str) -> str:
-    """Parse the base URL."""
-    return base_url.removeprefix('https://')
+    """Parse the host name out of the base URL, with or without a scheme."""
+    return urllib.parse.urlsplit(base_url).netloc or base_url.rstrip('/')
+
+
+def is_warmup_event(events: EventsTypeDef) -> bool:
+    """Check if the event is a scheduled ping only meant to keep the container warm."""
+    return events.get('source') == 'serverless-plugin-warmup' or bool(events.get('warmer'))
+
+
+def skip_warmup(handler: HandlerTypeDef) -> HandlerTypeDef:
+    """Decorate a lambda handler to return early on warmup events.
+
+    The wrapped handler is not called for warmup pings, so they never read the
+    bearer token or reach the Clumio API.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(events: EventsTypeDef, context: LambdaContext) -> dict[str, Any]:
+        if is_warmup_event(events):
+            return {'status': STATUS_OK, 'msg': 'warm'}
+        return handler(events, context)
+
+    return wrapper
 
 
 def get_sort_and_ts_filter(
@@ -74,37 +125,133 @@ def get_sort_and_ts_filter(
 
 
 def get_total_list(
-    function: Callable, api_filter: str, lookback_days: int | None = None, **kwargs: Any
+    function: Callable,
+    api_filter: str | dict,
+    lookback_days: int | None = None,
+    limit: int = PAGE_LIMIT,
+    workers: int = LIST_WORKERS,
+    **kwargs: Any,
 ) -> list:
     """Get the list of all items.
 
+    The first page gives the number of pages, the remaining ones are then
+    requested concurrently and merged in page order. Throttled pages are retried.
+
+    Args:
+        function: A list API function call with pagination feature.
+        api_filter: The filter applied to the list API, as a dict or a parsable JSON document.
+        lookback_days: Calculate backup status for the last `lookback_days` days.
+        limit: The number of items requested per page.
+        workers: The maximum number of pages fetched at once.
+        kwargs:
+         - sort: The sorting applied to the list API.
+    """
+    params = {'filter': serialize_filter(api_filter), 'limit': limit, **kwargs}
+    if lookback_days is not None:
+        # Only get assets with backups within the lookback_days range.
+        params['lookback_days'] = lookback_days
+    first_page = _get_page(function, {**params, 'start': 1})
+    if not first_page.total_count:
+        return []
+    total_list = list(first_page.embedded.items)
+    starts = range(2, (first_page.total_pages_count or 1) + 1)
+    if not starts:
+        return total_list
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(starts))) as executor:
+        pages = executor.map(lambda start: _get_page(function, {**params, 'start': start}), starts)
+        for page in pages:
+            if page.total_count:
+                total_list.extend(page.embedded.items)
+    return total_list
+
+
+def iter_total_list(
+    function: Callable,
+    api_filter: str | dict,
+    lookback_days: int | None = None,
+    limit: int = PAGE_LIMIT,
+    **kwargs: Any,
+) -> Generator[Any]:
+    """Iterate over all items, only requesting the next page when it is reached.
+
+    Callers that stop iterating early do not pay for the remaining pages.
+
     Args:
         function: A list API function call with pagination feature.
-        api_filter: The filter applied to the list API as a parsable JSON document.
+        api_filter: The filter applied to the list API, as a dict or a parsable JSON document.
         lookback_days: Calculate backup status for the last `lookback_days` days.
+        limit: The number of items requested per page.
         kwargs:
          - sort: The sorting applied to the list API.
     """
+    api_filter = serialize_filter(api_filter)
     start = 1
-    total_list = []
     while True:
-        params = {'filter': api_filter, 'start': start, **kwargs}
+        params = {'filter': api_filter, 'start': start, 'limit': limit, **kwargs}
         if lookback_days is not None:
             # Only get assets with backups within the lookback_days range.
             params['lookback_days'] = lookback_days
-        raw_response, parsed_response = function(**params)
-        # Raise error if raw response is not ok.
-        if not raw_response.ok:
-            raise exceptions.clumio_exception.ClumioException(
-                raw_response.reason, raw_response.content
-            )
+        parsed_response = _get_page(function, params)
         if not parsed_response.total_count:
-            break
-        total_list.extend(parsed_response.embedded.items)
+            return
+        yield from parsed_response.embedded.items
         if parsed_response.total_pages_count <= start:
-            break
+            return
         start += 1
-    return total_list
+
+
+def serialize_filter(api_filter: str | dict) -> str:
+    """Serialize a list API filter, leaving an already serialized one as is."""
+    return api_filter if isinstance(api_filter, str) else json.dumps(api_filter)
+
+
+def _get_page(function: Callable, params: dict[str, Any]) -> Any:
+    """Call a list API function and return its parsed response.
+
+    Responses with a retryable status are retried up to MAX_RETRY times.
+    """
+    for attempt in range(MAX_RETRY):
+        raw_response, parsed_response = function(**params)
+        if raw_response.status_code not in RETRYABLE_STATUS_CODES or attempt == MAX_RETRY - 1:
+            break
+        logger.warning(
+            'Page %s request failed with status %s, retrying.',
+            params.get('start'),
+            raw_response.status_code,
+        )
+        _sleep_before_retry(attempt)
+    # Raise error if raw response is not ok.
+    if not raw_response.ok:
+        raise exceptions.clumio_exception.ClumioException(raw_response.reason, raw_response.content)
+    return parsed_response
+
+
+def _sleep_before_retry(attempt: int) -> None:
+    """Sleep before retrying a request.
+
+    Exponential back-off with full jitter, so fanned out lambdas do not retry in lockstep.
+    """
+    time.sleep(random.uniform(0, RETRY_BASE_DELAY_SECONDS * 2**attempt))  # noqa: S311
+
+
+def get_first_page(
+    function: Callable, api_filter: str | dict, limit: int = 1, **kwargs: Any
+) -> list:
+    """Get the items of the first page only, for callers that need no more.
+
+    Args:
+        function: A list API function call with pagination feature.
+        api_filter: The filter applied to the list API, as a dict or a parsable JSON document.
+        limit: The maximum number of items requested.
+        kwargs:
+         - sort: The sorting applied to the list API.
+    """
+    parsed_response = _get_page(
+        function, {'filter': serialize_filter(api_filter), 'start': 1, 'limit': limit, **kwargs}
+    )
+    if not parsed_response.total_count:
+        return []
+    return parsed_response.embedded.items
 
 
 def get_environment_id_or_raise(
@@ -129,25 +276,39 @@ def get_environment_id(
     if not target_region:
         return ERROR_CODE, 'target_region is required.'
 
+    try:
+        return STATUS_OK, _lookup_environment_id(client, target_account, target_region)
+    except Error as error:
+        return ERROR_CODE, str(error)
+
+
+@functools.lru_cache(maxsize=32)
+def _lookup_environment_id(
+    client: clumioapi_client.ClumioAPIClient, target_account: str, target_region: str
+) -> str:
+    """List the environment of an account and region, raising if there is none.
+
+    Environments do not change for the lifetime of a container, so the result
+    is cached. The client is part of the key since it is bound to the token,
+    and failures raise so that they are not cached.
+    """
     env_filter = {
         'account_native_id': {'$eq': target_account},
         'aws_region': {'$eq': target_region},
     }
-    retry = 0
     response: ListAWSEnvironmentsResponse | None = None
-    while retry < MAX_RETRY:
+    for attempt in range(MAX_RETRY):
         _, response = client.aws_environments_v1.list_aws_environments(
             filter=json.dumps(env_filter)
         )
-        if response:
+        if response or attempt == MAX_RETRY - 1:
             break
-        time.sleep(1)
-        retry += 1
+        _sleep_before_retry(attempt)
     if not response:
-        return ERROR_CODE, 'Error when listing the aws environments.'
+        raise Error('Error when listing the aws environments.')
     elif not response.current_count:
-        return ERROR_CODE, 'No authorized environment found.'
-    return 200, response.embedded.items[0].p_id
+        raise Error('No authorized environment found.')
+    return response.embedded.items[0].p_id
 
 
 def get_bearer_token_if_not_exists(clumio_token: str | None) -> str:
@@ -161,30 +322,78 @@ def get_bearer_token_if_not_exists(clumio_token: str | None) -> str:
 
 
 def get_bearer_token() -> StatusAndMsgTypeDef:
-    """Retrieve the bearer token from secret manager."""
+    """Retrieve the bearer token from secret manager.
+
+    A successfully read token is reused for TOKEN_CACHE_TTL_SECONDS, or the
+    number of seconds in the CLUMIO_TOKEN_CACHE_TTL environment variable, so
+    warm invocations skip the Secrets Manager round-trip while a rotated
+    secret is still picked up shortly after.
+    """
     secret_arn = os.environ.get('CLUMIO_TOKEN_ARN')
     if not secret_arn:
         # Either provide clumio_token in JSON input file or
         # enter the token in the ClumioTokenArn parameter of the stack.
         return 411, 'CLUMIO_TOKEN_ARN environment variable is not set.'
-    secretsmanager = boto3.client('secretsmanager')
+    cached_token, expires = _TOKEN_CACHE.get(secret_arn, ('', 0.0))
+    if cached_token and time.monotonic() < expires:
+        return STATUS_OK, cached_token
+    # Only load botocore when the token has to be read from the secret.
+    import botocore.exceptions  # noqa: PLC0415
+
+    secretsmanager = get_secrets_manager_client()
     try:
         logger.info('Retrieving Clumio bearer token from AWS secret: %s', secret_arn)
         secret_value = secretsmanager.get_secret_value(SecretId=secret_arn)
-        secret_dict = json.loads(secret_value['SecretString'])
-        # Get the Clumio token from the key/value pair.
-        values = list(secret_dict.values())
-        clumio_token = values[0]
+        clumio_token = parse_secret_string(secret_value['SecretString'])
+        _TOKEN_CACHE[secret_arn] = (clumio_token, time.monotonic() + _get_token_cache_ttl())
         return STATUS_OK, clumio_token
     except botocore.exceptions.ClientError as client_error:
         code = client_error.response['Error']['Code']
         return 411, f'Describe secret failed - {code}'
 
 
+def _get_token_cache_ttl() -> int:
+    """Get the number of seconds a token read from the secret is reused."""
+    ttl = os.environ.get('CLUMIO_TOKEN_CACHE_TTL')
+    if ttl is None:
+        return TOKEN_CACHE_TTL_SECONDS
+    try:
+        return int(ttl)
+    except ValueError:
+        logger.warning(
+            'Invalid CLUMIO_TOKEN_CACHE_TTL %r, using %s seconds.', ttl, TOKEN_CACHE_TTL_SECONDS
+        )
+        return TOKEN_CACHE_TTL_SECONDS
+
+
+def parse_secret_string(secret_string: str) -> str:
+    """Get the Clumio token from the key/value pair of the secret."""
+    secret_dict = json.loads(secret_string)
+    return next(iter(secret_dict.values()))
+
+
+@functools.cache
+def get_secrets_manager_client() -> SecretsManagerClient:
+    """Get the Secrets Manager client, shared across warm invocations.
+
+    boto3 is imported here rather than at the module level so that handlers
+    receiving the token in their input do not pay its import time.
+    """
+    import boto3  # noqa: PLC0415
+    import botocore.config  # noqa: PLC0415
+
+    return boto3.client('secretsmanager', config=botocore.config.Config(**SECRETS_MANAGER_CONFIG))
+
+
+@functools.lru_cache(maxsize=4)
 def get_clumio_api_client(
     base_url: str, clumio_token: str, raw_response: bool = True
 ) -> clumioapi_client.ClumioAPIClient:
-    """Get the Clumio REST API client."""
+    """Get the Clumio REST API client.
+
+    Clients are cached per base URL, token and response mode, so a warm
+    container builds its client once instead of on every invocation.
+    """
     base_url = parse_base_url(base_url)
     config = configuration.Configuration(
         api_token=clumio_token, hostname=base_url, raw_response=raw_response
@@ -192,6 +401,15 @@ def get_clumio_api_client(
     return clumioapi_client.ClumioAPIClient(config)
 
 
+def get_retry_after(raw_response: requests.Response) -> int | None:
+    """Get the number of seconds to wait from the Retry-After header, if any.
+
+    Only the delay-seconds form of the header is supported, HTTP dates are ignored.
+    """
+    retry_after = raw_response.headers.get('Retry-After', '')
+    return int(retry_after) if retry_after.isdigit() else None
+
+
 def filter_backup_records_by_tags(
     backup_records: list[dict],
     search_tag_key: str | None,
@@ -202,12 +420,14 @@ def filter_backup_records_by_tags(
     # Filter the result based on the tags.
     if not (search_tag_key and search_tag_value):
         return backup_records
-    tags_filtered_backups = []
-    for backup in backup_records:
-        tags = {tag['key']: tag['value'] for tag in backup['backup_record'][tag_field]}
-        if tags.get(search_tag_key, None) == search_tag_value:
-            tags_filtered_backups.append(backup)
-    return tags_filtered_backups
+    return [
+        backup
+        for backup in backup_records
+        if any(
+            tag['key'] == search_tag_key and tag['value'] == search_tag_value
+            for tag in backup['backup_record'][tag_field] or ()
+        )
+    ]
 
 
 def to_dict_or_none(obj: Any) -> dict | None:
@@ -217,15 +437,22 @@ def to_dict_or_none(obj: Any) -> dict | None:
 
 def tags_from_dict(tags: list[dict[str, str]]) -> list[aws_tag_common_model.AwsTagCommonModel]:
     """Convert list of tags from dict to AwsTagCommonModel."""
-    tag_list = []
-    for tag in tags:
-        tag_list.append(aws_tag_common_model.AwsTagCommonModel(key=tag['key'], value=tag['value']))
-    return tag_list
+    tag_model = aws_tag_common_model.AwsTagCommonModel
+    return [tag_model(key=tag['key'], value=tag['value']) for tag in tags]
 
 
 def generate_random_string(length: int = 13) -> str:
     """Generate run token for restore."""
-    return ''.join(secrets.choice(string.ascii_letters) for _ in range(length))
+    return ''.join(_SYSTEM_RANDOM.choices(string.ascii_letters, k=length))
+
+
+def get_run_token(context: LambdaContext | None) -> str:
+    """Get the run token for restore.
+
+    The Lambda request ID is used so the token can be traced back to the Lambda
+    logs. A random string is generated when running outside of Lambda.
+    """
+    return getattr(context, 'aws_request_id', None) or generate_random_string()
 
 
 def get_append_tags(target_specs: dict, resource_type: str) -> dict:
@@ -253,13 +480,35 @@ def append_tags_to_source_tags(tags: list[dict], append_tags: dict) -> list[dict
     """Append the append_tags from target_specs to the asset source tags for restore."""
     if tags is None:
         tags = []
+    existing = {(tag['key'], tag['value']) for tag in tags}
     for tag_key, tag_value in append_tags.items():
-        new_tag = {'key': tag_key, 'value': tag_value}
-        if new_tag not in tags:
-            tags.append(new_tag)
+        if (tag_key, tag_value) not in existing:
+            tags.append({'key': tag_key, 'value': tag_value})
+            existing.add((tag_key, tag_value))
     return tags
 
 
+def set_restore_task(inputs: dict, task_id: str) -> None:
+    """Record a newly submitted restore task in the inputs of the task poller."""
+    inputs['task'] = task_id
+    inputs['submitted_at'] = time.time()
+    inputs['min_poll_after'] = MIN_POLL_AFTER_SECONDS
+
+
+def set_next_poll(inputs: dict, seconds: float | None = None) -> None:
+    """Record in the inputs of the task poller when to poll the task again.
+
+    The Wait states of the state machine read it with SecondsPath, so it is always
+    a whole number of seconds and defaults to MIN_POLL_AFTER_SECONDS.
+    """
+    inputs['next_poll_seconds'] = math.ceil(seconds) if seconds else MIN_POLL_AFTER_SECONDS
+
+
+def get_poll_delay(inputs: dict) -> float:
+    """Get the number of seconds left before the restore task is worth polling."""
+    return inputs.get('submitted_at', 0) + inputs.get('min_poll_after', 0) - time.time()
+
+
 def simple_timer(timeout: float, interval: float, label: str | None = None) -> Generator[float]:
     """Simple timer iterator.
 
@@ -16,10 +16,70 @@
 from __future__ import annotations
 
 import unittest
+from unittest import mock
 
 import clumio_bulk_rds_restore
+import common
+import requests
+from aws_lambda_powertools.utilities.typing import LambdaContext
 
 
 class TestImportable(unittest.TestCase):
     def test_lambda_handler_exists(self) -> None:
         self.assertTrue(hasattr(clumio_bulk_rds_restore, 'lambda_handler'))
+
+
+class TestLambdaHandler(unittest.TestCase):
+    """Test the lambda handler for restoring RDS."""
+
+    def setUp(self) -> None:
+        """Setup method for class."""
+        api_client_patch = mock.patch('clumioapi.clumioapi_client.ClumioAPIClient')
+        self.api_client = api_client_patch.start()
+        common.get_clumio_api_client.cache_clear()
+        self.addCleanup(api_client_patch.stop)
+        env_id_patch = mock.patch('common.get_environment_id_or_raise', return_value='env_id')
+        env_id_patch.start()
+        self.addCleanup(env_id_patch.stop)
+        self.context = LambdaContext()
+        self.record = {
+            'resource_id': 'resource_id',
+            'backup_record': {
+                'source_backup_id': 'backup_id',
+                'source_instance_class': 'db.t3.micro',
+                'source_is_publicly_accessible': False,
+            },
+        }
+
+    def test_restore_record(self) -> None:
+        """Verify the restore task of the record is returned."""
+        ok_response = requests.Response()
+        ok_response.status_code = 200
+        restore = self.api_client().restored_aws_rds_resources_v1.restore_aws_rds_resource
+        restore.return_value = (ok_response, mock.Mock(task_id='task_id'))
+        events = {
+            'clumio_token': 'bearer_token',
+            'target': {'target_rds_name': 'rds_name'},
+            'record': self.record,
+        }
+        lambda_result = clumio_bulk_rds_restore.lambda_handler(events, self.context)
+        self.assertEqual(lambda_result['status'], 200)
+        self.assertEqual(lambda_result['inputs']['task'], 'task_id')
+        self.assertEqual(lambda_result['inputs']['source_backup_id'], 'backup_id')
+        restore.assert_called_once()
+
+    def test_run_token_per_invocation(self) -> None:
+        """Verify each restore gets the request ID of its own invocation as run token."""
+        ok_response = requests.Response()
+        ok_response.status_code = 200
+        restore = self.api_client().restored_aws_rds_resources_v1.restore_aws_rds_resource
+        restore.return_value = (ok_response, mock.Mock(task_id='task_id'))
+        events = {
+            'clumio_token': 'bearer_token',
+            'target': {'target_rds_name': 'rds_name'},
+            'record': self.record,
+        }
+        for request_id in ('request_1', 'request_2'):
+            context = mock.Mock(aws_request_id=request_id)
+            lambda_result = clumio_bulk_rds_restore.lambda_handler(events, context)
+            self.assertEqual(lambda_result['inputs']['run_token'], request_id)
@@ -15,10 +15,14 @@
 
 from __future__ import annotations
 
+import time
 import unittest
+from typing import Any
 from unittest import mock
 
 import clumio_bulk_retrieve_restore_task
+import common
+import requests
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from clumioapi.models import read_task_response
 
@@ -30,29 +34,44 @@ class TestLambdaHandler(unittest.TestCase):
         """Setup method for class."""
         api_client_patch = mock.patch('clumioapi.clumioapi_client.ClumioAPIClient')
         self.api_client = api_client_patch.start()
+        self.addCleanup(api_client_patch.stop)
+        # Report unfinished tasks after the first read instead of polling for minutes.
+        timeout_patch = mock.patch.object(
+            clumio_bulk_retrieve_restore_task, 'POLL_TIMEOUT_SECONDS', 0
+        )
+        timeout_patch.start()
+        self.addCleanup(timeout_patch.stop)
+        common.get_clumio_api_client.cache_clear()
         self.context = LambdaContext()
-        self.events = {
-            'bear': 'bearer_token',
+        self.events: dict[str, Any] = {
+            'clumio_token': 'bearer_token',
             'base_url': 'base_url',
             'inputs': {'task': 'task_id'},
         }
+        self.ok_response = requests.Response()
+        self.ok_response.status_code = 200
 
     def test_read_task(self) -> None:
         """Verify the return when the environment id is bad."""
         # In-progress states.
         for status in ['queued', 'in_progress']:
-            self.api_client().tasks_v1.read_task.return_value = read_task_response.ReadTaskResponse(
-                status=status,
+            self.api_client().tasks_v1.read_task.return_value = (
+                self.ok_response,
+                read_task_response.ReadTaskResponse(status=status),
             )
             lambda_result = clumio_bulk_retrieve_restore_task.lambda_handler(
                 self.events, self.context
             )
             self.assertEqual(lambda_result['status'], 205)
             self.assertIn('not done', lambda_result['msg'])
+            self.assertEqual(
+                lambda_result['inputs']['next_poll_seconds'], common.MIN_POLL_AFTER_SECONDS
+            )
 
         # Succeed state.
-        self.api_client().tasks_v1.read_task.return_value = read_task_response.ReadTaskResponse(
-            status='completed',
+        self.api_client().tasks_v1.read_task.return_value = (
+            self.ok_response,
+            read_task_response.ReadTaskResponse(status='completed'),
         )
         lambda_result = clumio_bulk_retrieve_restore_task.lambda_handler(self.events, self.context)
         self.assertEqual(lambda_result['status'], 200)
@@ -60,8 +79,9 @@ class TestLambdaHandler(unittest.TestCase):
 
         # Failure states.
         for status in ['failed', 'aborted']:
-            self.api_client().tasks_v1.read_task.return_value = read_task_response.ReadTaskResponse(
-                status=status,
+            self.api_client().tasks_v1.read_task.return_value = (
+                self.ok_response,
+                read_task_response.ReadTaskResponse(status=status),
             )
             lambda_result = clumio_bulk_retrieve_restore_task.lambda_handler(
                 self.events, self.context
@@ -69,5 +89,32 @@ class TestLambdaHandler(unittest.TestCase):
             self.assertEqual(lambda_result['status'], 403)
             self.assertIn('failed', lambda_result['msg'])
 
+    def test_task_not_yet_pollable(self) -> None:
+        """Verify the task is not read right after it was submitted."""
+        self.events['inputs'].update(submitted_at=time.time(), min_poll_after=30)
+        lambda_result = clumio_bulk_retrieve_restore_task.lambda_handler(self.events, self.context)
+        self.assertEqual(lambda_result['status'], 205)
+        self.assertGreater(lambda_result['inputs']['next_poll_seconds'], 0)
+        self.assertIsInstance(lambda_result['inputs']['next_poll_seconds'], int)
+        self.api_client().tasks_v1.read_task.assert_not_called()
+
+    def test_read_task_throttled(self) -> None:
+        """Verify the Retry-After hint is returned when the API is throttled."""
+        throttled_response = requests.Response()
+        throttled_response.status_code = 429
+        throttled_response.headers['Retry-After'] = '42'
+        self.api_client().tasks_v1.read_task.return_value = (throttled_response, None)
+        lambda_result = clumio_bulk_retrieve_restore_task.lambda_handler(self.events, self.context)
+        self.assertEqual(lambda_result['status'], 205)
+        self.assertIn('throttled', lambda_result['msg'])
+        self.assertEqual(lambda_result['inputs']['next_poll_seconds'], 42)
+
+        # Without a Retry-After header, poll again after the default delay.
+        del throttled_response.headers['Retry-After']
+        lambda_result = clumio_bulk_retrieve_restore_task.lambda_handler(self.events, self.context)
+        self.assertEqual(
+            lambda_result['inputs']['next_poll_seconds'], common.MIN_POLL_AFTER_SECONDS
+        )
+
     def test_lambda_handler_exists(self) -> None:
         self.assertTrue(hasattr(clumio_bulk_retrieve_restore_task, 'lambda_handler'))
@@ -16,10 +16,100 @@
 from __future__ import annotations
 
 import unittest
+from typing import Any
+from unittest import mock
 
 import clumio_bulk_s3_list_backups
+import common
+import requests
+from aws_lambda_powertools.utilities.typing import LambdaContext
 
 
 class TestImportable(unittest.TestCase):
     def test_lambda_handler_exists(self) -> None:
         self.assertTrue(hasattr(clumio_bulk_s3_list_backups, 'lambda_handler'))
+
+
+class TestLambdaHandler(unittest.TestCase):
+    """Test the lambda handler for listing S3 backups."""
+
+    def setUp(self) -> None:
+        """Setup method for class."""
+        api_client_patch = mock.patch('clumioapi.clumioapi_client.ClumioAPIClient')
+        self.api_client = api_client_patch.start()
+        self.addCleanup(api_client_patch.stop)
+        common.get_clumio_api_client.cache_clear()
+        common._lookup_environment_id.cache_clear()
+        clumio_bulk_s3_list_backups._PG_ID_CACHE.clear()
+        self.context = LambdaContext()
+        self.events: dict[str, Any] = {
+            'clumio_token': 'bearer_token',
+            'search_pg_name': 'pg_name',
+            'target': {},
+        }
+        self.ok_response = requests.Response()
+        self.ok_response.status_code = 200
+        client = self.api_client()
+        self.list_pgs = client.protection_groups_v1.list_protection_groups
+        self.list_pg_assets = client.protection_groups_s3_assets_v1.list_protection_group_s3_assets
+        self.list_backups = client.backup_protection_groups_v1.list_backup_protection_groups
+        self.list_pgs.return_value = self._page([mock.Mock(p_id='pg_id')])
+        self.list_backups.return_value = self._page([mock.Mock(p_id='backup_id')])
+
+    def _page(self, items: list, total_pages_count: int = 1) -> tuple:
+        """Build the raw and parsed responses of a list API page."""
+        parsed_response = mock.Mock(
+            total_count=len(items),
+            total_pages_count=total_pages_count,
+            embedded=mock.Mock(items=items),
+        )
+        return self.ok_response, parsed_response
+
+    def test_pg_not_found(self) -> None:
+        """Verify the return when no protection group has the searched name."""
+        self.list_pgs.return_value = self._page([])
+        lambda_result = clumio_bulk_s3_list_backups.lambda_handler(self.events, self.context)
+        self.assertEqual(lambda_result['status'], 207)
+        self.assertEqual(lambda_result['msg'], 'empty pg list')
+        self.assertNotIn((self.api_client(), 'pg_name'), clumio_bulk_s3_list_backups._PG_ID_CACHE)
+
+    def test_bucket_filter_found_on_first_page(self) -> None:
+        """Verify the asset listing stops once every filtered bucket is found."""
+        self.events['search_bucket_names'] = ['bucket_1']
+        self.list_pg_assets.return_value = self._page(
+            [mock.Mock(p_id='asset_1', bucket_name='bucket_1')], total_pages_count=2
+        )
+        lambda_result = clumio_bulk_s3_list_backups.lambda_handler(self.events, self.context)
+        self.assertEqual(lambda_result['status'], 200)
+        self.list_pg_assets.assert_called_once()
+        record = lambda_result['records'][0]
+        self.assertEqual(record['backup_id'], 'backup_id')
+        self.assertEqual(record['pg_asset_ids'], ['asset_1'])
+        self.assertEqual(record['pg_bucket_names'], ['bucket_1'])
+        self.list_backups.assert_called_once()
+        self.assertEqual(self.list_backups.call_args.kwargs['limit'], 1)
+
+    def test_bucket_filter_outside_pg(self) -> None:
+        """Verify buckets of the filter that are not in the protection group are dropped."""
+        self.events['search_bucket_names'] = ['bucket_1', 'other_bucket']
+        self.list_pg_assets.return_value = self._page(
+            [
+                mock.Mock(p_id='asset_1', bucket_name='bucket_1'),
+                mock.Mock(p_id='asset_2', bucket_name='bucket_2'),
+            ]
+        )
+        with self.assertLogs(clumio_bulk_s3_list_backups.logger, 'WARNING') as logs:
+            lambda_result = clumio_bulk_s3_list_backups.lambda_handler(self.events, self.context)
+        self.assertIn('other_bucket', logs.output[0])
+        self.assertEqual(lambda_result['status'], 200)
+        record = lambda_result['records'][0]
+        self.assertEqual(record['pg_asset_ids'], ['asset_1'])
+        self.assertEqual(record['pg_bucket_names'], ['bucket_1'])
+
+    def test_no_pg_assets(self) -> None:
+        """Verify a cached protection group ID is dropped when it has no assets."""
+        self.list_pg_assets.return_value = self._page([])
+        lambda_result = clumio_bulk_s3_list_backups.lambda_handler(self.events, self.context)
+        self.assertEqual(lambda_result['status'], 207)
+        self.assertEqual(lambda_result['msg'], 'empty set of pg s3 assets')
+        self.assertFalse(clumio_bulk_s3_list_backups._PG_ID_CACHE)
@@ -16,10 +16,69 @@
 from __future__ import annotations
 
 import unittest
+from typing import Any
+from unittest import mock
 
 import clumio_bulk_s3_restore
+import common
+import requests
+from aws_lambda_powertools.utilities.typing import LambdaContext
 
 
 class TestImportable(unittest.TestCase):
     def test_lambda_handler_exists(self) -> None:
         self.assertTrue(hasattr(clumio_bulk_s3_restore, 'lambda_handler'))
+
+
+class TestLambdaHandler(unittest.TestCase):
+    """Test the lambda handler for restoring S3."""
+
+    def setUp(self) -> None:
+        """Setup method for class."""
+        api_client_patch = mock.patch('clumioapi.clumioapi_client.ClumioAPIClient')
+        self.api_client = api_client_patch.start()
+        self.addCleanup(api_client_patch.stop)
+        common.get_clumio_api_client.cache_clear()
+        self.context = LambdaContext()
+        self.events: dict[str, Any] = {
+            'clumio_token': 'bearer_token',
+            'target': {'target_account': '123456789012', 'target_bucket': 'bucket'},
+            'record': {
+                'backup_id': 'backup_id',
+                'object_filters': {},
+                'pg_asset_ids': ['asset_id'],
+            },
+        }
+        self.ok_response = requests.Response()
+        self.ok_response.status_code = 200
+        client = self.api_client()
+        self.list_buckets = client.aws_s3_buckets_v1.list_aws_s3_buckets
+        self.restore = client.restored_protection_groups_v1.restore_protection_group
+        self.restore.return_value = (self.ok_response, mock.Mock(task_id='task_id'))
+
+    def _page(self, items: list) -> tuple:
+        """Build the raw and parsed responses of a list API page."""
+        parsed_response = mock.Mock(
+            total_count=len(items), total_pages_count=1, embedded=mock.Mock(items=items)
+        )
+        return self.ok_response, parsed_response
+
+    def test_target_bucket_not_found(self) -> None:
+        """Verify the return when the target bucket does not exist."""
+        self.list_buckets.return_value = self._page([])
+        lambda_result = clumio_bulk_s3_restore.lambda_handler(self.events, self.context)
+        self.assertEqual(lambda_result['status'], 207)
+        self.assertEqual(lambda_result['msg'], 'no target bucket found')
+        self.restore.assert_not_called()
+
+    def test_restore(self) -> None:
+        """Verify a single bucket is requested and the restore task is started."""
+        self.list_buckets.return_value = self._page(
+            [mock.Mock(p_id='bucket_id', environment_id='env_id')]
+        )
+        lambda_result = clumio_bulk_s3_restore.lambda_handler(self.events, self.context)
+        self.assertEqual(lambda_result['status'], 200)
+        self.assertEqual(lambda_result['inputs']['task'], 'task_id')
+        self.list_buckets.assert_called_once()
+        self.assertEqual(1, self.list_buckets.call_args.kwargs['limit'])
+        self.restore.assert_called_once()
@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import datetime
 import unittest
+from typing import Any
 from unittest import mock
 
 import common
@@ -32,33 +33,45 @@ from clumioapi.models import (
 )
 
 
+def _page(p_id: str, total: int) -> tuple[requests.Response, Any]:
+    """Build an ok list_task page holding a single task out of total pages."""
+    ok_response = requests.Response()
+    ok_response.status_code = 200
+    return (
+        ok_response,
+        list_tasks_response.ListTasksResponse(
+            embedded=task_list_embedded.TaskListEmbedded(
+                items=[task_with_e_tag.TaskWithETag(p_id=p_id)]
+            ),
+            total_count=total,
+            total_pages_count=total,
+        ),
+    )
+
+
+def _non_ok_response(status_code: int) -> requests.Response:
+    """Build a response with the given non-ok status code."""
+    response = requests.Response()
+    response.status_code = status_code
+    return response
+
+
 class TestUtilFunctions(unittest.TestCase):
     """Test the common util functions."""
 
     def setUp(self) -> None:
         api_client_patch = mock.patch('clumioapi.clumioapi_client.ClumioAPIClient')
         self.api_client = api_client_patch.start()
+        common.get_clumio_api_client.cache_clear()
+        common._lookup_environment_id.cache_clear()
 
     def test_get_total_list(self) -> None:
         """Verify get_total_list function."""
         # Ok response.
         task_ids = ['1', '2']
-        ok_response = requests.Response()
-        ok_response.status_code = 200
-        return_vals = [
-            (
-                ok_response,
-                list_tasks_response.ListTasksResponse(
-                    embedded=task_list_embedded.TaskListEmbedded(
-                        items=[task_with_e_tag.TaskWithETag(p_id=task_id)]
-                    ),
-                    total_count=2,
-                    total_pages_count=2,
-                ),
-            )
-            for task_id in task_ids
+        self.api_client().tasks_v1.list_task.side_effect = [
+            _page(task_id, 2) for task_id in task_ids
         ]
-        self.api_client().tasks_v1.list_task.side_effect = return_vals
         tasks_list = common.get_total_list(
             self.api_client().tasks_v1.list_task,
             api_filter='api_filter',
@@ -66,11 +79,12 @@ class TestUtilFunctions(unittest.TestCase):
         )
         retrieved_task_ids = [task.p_id for task in tasks_list]
         self.assertEqual(task_ids, retrieved_task_ids)
+        self.api_client().tasks_v1.list_task.assert_any_call(
+            filter='api_filter', start=1, limit=common.PAGE_LIMIT, sort='sort'
+        )
 
         # Non-ok response.
-        non_ok_response = requests.Response()
-        non_ok_response.status_code = 401
-        self.api_client().tasks_v1.list_task.side_effect = [(non_ok_response, None)]
+        self.api_client().tasks_v1.list_task.side_effect = [(_non_ok_response(401), None)]
         with self.assertRaises(clumio_exception.ClumioException):
             _ = common.get_total_list(
                 self.api_client().tasks_v1.list_task,
@@ -78,6 +92,68 @@ class TestUtilFunctions(unittest.TestCase):
                 sort='sort',
             )
 
+    def test_iter_total_list(self) -> None:
+        """Verify iter_total_list only requests the pages that are consumed."""
+        self.api_client().tasks_v1.list_task.side_effect = lambda start, **_: _page(str(start), 3)
+        tasks = common.iter_total_list(self.api_client().tasks_v1.list_task, api_filter={})
+        self.assertEqual('1', next(tasks).p_id)
+        self.assertEqual(1, self.api_client().tasks_v1.list_task.call_count)
+        self.assertEqual(['2', '3'], [task.p_id for task in tasks])
+        self.assertEqual(3, self.api_client().tasks_v1.list_task.call_count)
+
+    def test_get_total_list_page_order(self) -> None:
+        """Verify get_total_list merges the concurrently fetched pages in order."""
+        self.api_client().tasks_v1.list_task.side_effect = lambda start, **_: _page(str(start), 3)
+        tasks_list = common.get_total_list(
+            self.api_client().tasks_v1.list_task, api_filter='api_filter', sort='sort'
+        )
+        self.assertEqual(['1', '2', '3'], [task.p_id for task in tasks_list])
+
+        # Non-ok response on a later page.
+        self.api_client().tasks_v1.list_task.side_effect = lambda start, **_: (
+            _page(str(start), 3) if start == 1 else (_non_ok_response(401), None)
+        )
+        with self.assertRaises(clumio_exception.ClumioException):
+            _ = common.get_total_list(self.api_client().tasks_v1.list_task, api_filter='api_filter')
+
+    @mock.patch('common.time.sleep')
+    def test_get_total_list_retry(self, mock_sleep: mock.Mock) -> None:
+        """Verify get_total_list retries pages with a retryable status."""
+        throttled_response = _non_ok_response(429)
+        self.api_client().tasks_v1.list_task.side_effect = [
+            (throttled_response, None),
+            _page('1', 1),
+        ]
+        tasks_list = common.get_total_list(
+            self.api_client().tasks_v1.list_task, api_filter='api_filter'
+        )
+        self.assertEqual(['1'], [task.p_id for task in tasks_list])
+        self.assertEqual(1, mock_sleep.call_count)
+
+        # Give up once the retries are exhausted.
+        self.api_client().tasks_v1.list_task.side_effect = None
+        self.api_client().tasks_v1.list_task.return_value = (throttled_response, None)
+        with self.assertRaises(clumio_exception.ClumioException):
+            _ = common.get_total_list(self.api_client().tasks_v1.list_task, api_filter='api_filter')
+        self.assertEqual(1 + common.MAX_RETRY - 1, mock_sleep.call_count)
+
+    def test_serialize_filter(self) -> None:
+        """Verify dict filters are serialized and string filters kept."""
+        api_filter = {'name': {'$eq': 'pg'}}
+        self.assertEqual('{"name": {"$eq": "pg"}}', common.serialize_filter(api_filter))
+        self.assertEqual('api_filter', common.serialize_filter('api_filter'))
+
+    def test_get_first_page(self) -> None:
+        """Verify get_first_page only requests a single page."""
+        self.api_client().tasks_v1.list_task.return_value = _page('1', 2)
+        tasks_list = common.get_first_page(
+            self.api_client().tasks_v1.list_task, api_filter='api_filter', sort='sort'
+        )
+        self.assertEqual(['1'], [task.p_id for task in tasks_list])
+        self.api_client().tasks_v1.list_task.assert_called_once_with(
+            filter='api_filter', start=1, limit=1, sort='sort'
+        )
+
     def test_get_environment_id(self) -> None:
         """Verify get_environment_id function."""
         # Empty response.
@@ -104,6 +180,16 @@ class TestUtilFunctions(unittest.TestCase):
         self.assertEqual(status_code, 200)
         self.assertEqual(env_id, 'env_id')
 
+        # Cached response.
+        list_aws_environments = self.api_client().aws_environments_v1.list_aws_environments
+        list_aws_environments.reset_mock()
+        status_code, env_id = common.get_environment_id(
+            self.api_client(), target_account, target_region
+        )
+        self.assertEqual(status_code, 200)
+        self.assertEqual(env_id, 'env_id')
+        list_aws_environments.assert_not_called()
+
     def test_filter_backup_records_by_tags(self) -> None:
         """Verify the filter_backup_records_by_tags function."""
         tag_field = 'source_asset_tags'
@@ -131,6 +217,98 @@ class TestUtilFunctions(unittest.TestCase):
         self.assertEqual(backup_records[0]['asset_id'], 'asset_id-1')
 
 
+class TestParseSecretString(unittest.TestCase):
+    def test_parse_secret_string(self) -> None:
+        self.assertEqual('token', common.parse_secret_string('{"token": "token"}'))
+        self.assertEqual('other', common.parse_secret_string('{"key": "other"}'))
+
+
+class TestGetBearerToken(unittest.TestCase):
+    def setUp(self) -> None:
+        common._TOKEN_CACHE.clear()
+        self.addCleanup(common._TOKEN_CACHE.clear)
+
+    @mock.patch.dict('os.environ', {'CLUMIO_TOKEN_ARN': 'secret_arn'})
+    @mock.patch('common.get_secrets_manager_client')
+    def test_get_bearer_token_cached(self, mock_client: mock.MagicMock) -> None:
+        mock_client().get_secret_value.return_value = {'SecretString': '{"token": "token"}'}
+        self.assertEqual((200, 'token'), common.get_bearer_token())
+        self.assertEqual((200, 'token'), common.get_bearer_token())
+        mock_client().get_secret_value.assert_called_once_with(SecretId='secret_arn')
+
+    @mock.patch.dict('os.environ', {'CLUMIO_TOKEN_ARN': 'secret_arn'})
+    @mock.patch('common.get_secrets_manager_client')
+    def test_get_bearer_token_expired(self, mock_client: mock.MagicMock) -> None:
+        mock_client().get_secret_value.return_value = {'SecretString': '{"token": "token"}'}
+        common.get_bearer_token()
+        common._TOKEN_CACHE['secret_arn'] = ('token', 0.0)
+        common.get_bearer_token()
+        self.assertEqual(2, mock_client().get_secret_value.call_count)
+
+    @mock.patch.dict('os.environ', {'CLUMIO_TOKEN_ARN': 'other_arn'})
+    @mock.patch('common.get_secrets_manager_client')
+    def test_get_bearer_token_other_secret(self, mock_client: mock.MagicMock) -> None:
+        common._TOKEN_CACHE['secret_arn'] = ('token', float('inf'))
+        mock_client().get_secret_value.return_value = {'SecretString': '{"token": "other"}'}
+        self.assertEqual((200, 'other'), common.get_bearer_token())
+        mock_client().get_secret_value.assert_called_once_with(SecretId='other_arn')
+
+    @mock.patch.dict(
+        'os.environ', {'CLUMIO_TOKEN_ARN': 'secret_arn', 'CLUMIO_TOKEN_CACHE_TTL': '0'}
+    )
+    @mock.patch('common.get_secrets_manager_client')
+    def test_get_bearer_token_cache_disabled(self, mock_client: mock.MagicMock) -> None:
+        mock_client().get_secret_value.return_value = {'SecretString': '{"token": "token"}'}
+        common.get_bearer_token()
+        common.get_bearer_token()
+        self.assertEqual(2, mock_client().get_secret_value.call_count)
+
+    @mock.patch.dict(
+        'os.environ', {'CLUMIO_TOKEN_ARN': 'secret_arn', 'CLUMIO_TOKEN_CACHE_TTL': 'five'}
+    )
+    @mock.patch('common.get_secrets_manager_client')
+    def test_get_bearer_token_invalid_cache_ttl(self, mock_client: mock.MagicMock) -> None:
+        mock_client().get_secret_value.return_value = {'SecretString': '{"token": "token"}'}
+        with self.assertLogs(common.logger, 'WARNING'):
+            self.assertEqual((200, 'token'), common.get_bearer_token())
+        self.assertEqual((200, 'token'), common.get_bearer_token())
+        mock_client().get_secret_value.assert_called_once_with(SecretId='secret_arn')
+
+
+class TestSkipWarmup(unittest.TestCase):
+    def test_skip_warmup(self) -> None:
+        handler = mock.Mock(return_value={'status': 200, 'msg': 'completed'})
+        wrapped = common.skip_warmup(handler)
+        self.assertEqual({'status': 200, 'msg': 'warm'}, wrapped({'warmer': True}, None))
+        self.assertEqual(
+            {'status': 200, 'msg': 'warm'}, wrapped({'source': 'serverless-plugin-warmup'}, None)
+        )
+        handler.assert_not_called()
+        self.assertEqual({'status': 200, 'msg': 'completed'}, wrapped({}, None))
+        handler.assert_called_once_with({}, None)
+
+
+class TestGetRunToken(unittest.TestCase):
+    def test_get_run_token_from_context(self) -> None:
+        context = mock.Mock(aws_request_id='request_id')
+        self.assertEqual('request_id', common.get_run_token(context))
+
+    def test_get_run_token_without_context(self) -> None:
+        self.assertEqual(13, len(common.get_run_token(None)))
+
+
+class TestAppendTagsToSourceTags(unittest.TestCase):
+    def test_append_tags_to_source_tags(self) -> None:
+        tags = [{'key': 'a', 'value': '1'}]
+        self.assertEqual(
+            [{'key': 'a', 'value': '1'}, {'key': 'b', 'value': '2'}],
+            common.append_tags_to_source_tags(tags, {'a': '1', 'b': '2'}),
+        )
+        self.assertEqual(
+            [{'key': 'a', 'value': '1'}], common.append_tags_to_source_tags(None, {'a': '1'})
+        )
+
+
 class TestGetSortAndTSFilter(unittest.TestCase):
     """Test the get_sort_and_ts_filter function."""
 
@@ -176,3 +354,8 @@ class TestParseBaseUrl(unittest.TestCase):
         self.assertEqual(
             'us-west-2.api.clumio.com', common.parse_base_url('https://us-west-2.api.clumio.com/')
         )
+
+    def test_parse_base_url_with_trailing_slash(self) -> None:
+        self.assertEqual(
+            'us-west-2.api.clumio.com', common.parse_base_url('us-west-2.api.clumio.com/')
+        )